@@ -1,15 +1,15 @@
-resource "aws_iam_policy" "publish_manager_topic" {
-  name        = "${local.prefix}-AllowPublishToManagerInstructionSNSTopic"
-  description = "Allows publishing messages to the Manager Instruction SNS Topic"
+resource "aws_iam_policy" "invoke_manage_instance" {
+  name        = "${local.prefix}-AllowInvokeManageInstanceLambda"
+  description = "Allows asynchronously invoking the Manage Instance Lambda function"
   policy = jsonencode({
     Version = "2012-10-17",
     Statement = [
       {
         Effect = "Allow",
         Action = [
-          "sns:Publish"
+          "lambda:InvokeFunction"
         ],
-        Resource = module.manager_instruction_sns_topic.topic_arn,
+        Resource = module.lambda_manage_instance.lambda_function_arn,
         Condition = {
           StringEquals = { "aws:ResourceTag/${local.prefix}:Related" = "true" }
         }
@@ -17,14 +17,14 @@ module "lambda_handle_interaction" {
   tracing_mode                      = "Active"
 
   environment_variables = {
-    MANAGER_INSTRUCTION_SNS_TOPIC_ARN = module.manager_instruction_sns_topic.topic_arn
-    DISCORD_APP_PUBLIC_KEY            = var.discord_app_public_key
+    MANAGE_INSTANCE_FUNCTION_NAME = module.lambda_manage_instance.lambda_function_name
+    DISCORD_APP_PUBLIC_KEY        = var.discord_app_public_key
   }
 
   attach_tracing_policy = true
   attach_policies       = true
   number_of_policies    = 2
-  policies              = [aws_iam_policy.publish_manager_topic.arn, local.xray_policy_arn]
+  policies              = [aws_iam_policy.invoke_manage_instance.arn, local.xray_policy_arn]
 }
 
 module "lambda_manage_instance" {
@@ -55,11 +55,3 @@ module "lambda_manage_instance" {
   number_of_policies    = 2
   policies              = [aws_iam_policy.manage_instance.arn, local.xray_policy_arn]
 }
-
-resource "aws_lambda_permission" "with_sns" {
-  statement_id  = "AllowExecutionFromSNS"
-  action        = "lambda:InvokeFunction"
-  function_name = module.lambda_manage_instance.lambda_function_name
-  principal     = "sns.amazonaws.com"
-  source_arn    = module.manager_instruction_sns_topic.topic_arn
-}
@@ -1,23 +1,26 @@
 import base64
-import json
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-import boto3
-from botocore.client import BaseClient
-from nacl.exceptions import BadSignatureError
-from nacl.signing import VerifyKey
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.INFO)
 
 DISCORD_APP_PUBLIC_KEY = os.environ["DISCORD_APP_PUBLIC_KEY"]
-MANAGER_INSTRUCTION_SNS_TOPIC_ARN = os.environ[
-    "MANAGER_INSTRUCTION_SNS_TOPIC_ARN"
-]
+MANAGE_INSTANCE_FUNCTION_NAME = os.environ["MANAGE_INSTANCE_FUNCTION_NAME"]
 
-_sns_client: BaseClient = boto3.client("sns")
+# boto3 is imported on first use so containers only answering PINGs skip it
+_lambda_client: Optional["BaseClient"] = None
+_verify_key = Ed25519PublicKey.from_public_bytes(
+    bytes.fromhex(DISCORD_APP_PUBLIC_KEY)
+)
 
 # Discord interaction constants we care about
 PING_INTERACTION = 1
@@ -29,19 +32,15 @@ def _json_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "statusCode": status_code,
         "headers": {"content-type": "application/json"},
-        "body": json.dumps(body),
+        "body": orjson.dumps(body).decode("utf-8"),
     }
 
 
-def _get_header(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
-    if not headers:
-        return None
+_PING_RESPONSE = _json_response(200, {"type": PING_INTERACTION})
+
 
-    lowercase = name.lower()
-    for key, value in headers.items():
-        if key and key.lower() == lowercase:
-            return value
-    return None
+def _get_headers(event: Dict[str, Any]) -> Dict[str, str]:
+    return {key.lower(): value for key, value in (event.get("headers") or {}).items()}
 
 
 def _get_body_bytes(event: Dict[str, Any]) -> bytes:
@@ -53,36 +52,52 @@ def _get_body_bytes(event: Dict[str, Any]) -> bytes:
     return body.encode("utf-8")
 
 
-def _verify_request(event: Dict[str, Any], body_bytes: bytes) -> bool:
-    signature = _get_header(event.get("headers"), "x-signature-ed25519")
-    timestamp = _get_header(event.get("headers"), "x-signature-timestamp")
+def _verify_request(headers: Dict[str, str], body_bytes: bytes) -> bool:
+    signature = headers.get("x-signature-ed25519")
+    timestamp = headers.get("x-signature-timestamp")
 
     if not signature or not timestamp:
         return False
 
-    verify_key = VerifyKey(bytes.fromhex(DISCORD_APP_PUBLIC_KEY))
-
     try:
-        verify_key.verify(
-            timestamp.encode("utf-8") + body_bytes, bytes.fromhex(signature)
+        _verify_key.verify(
+            bytes.fromhex(signature), timestamp.encode("utf-8") + body_bytes
         )
         return True
-    except BadSignatureError:
+    except InvalidSignature:
         return False
 
 
-def _find_server_option_value(
+def _extract_command_fields(
     interaction: Dict[str, Any],
-) -> Optional[str]:
-    data = interaction.get("data", {})
-    options = data.get("options") or []
-    for option in options:
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    data = interaction.get("data") or {}
+
+    server_value = None
+    for option in data.get("options") or ():
         if option.get("name") == "server":
-            return option.get("value")
-    return None
+            server_value = option.get("value")
+            break
+
+    return (
+        data.get("name"),
+        interaction.get("id"),
+        interaction.get("token"),
+        server_value,
+    )
+
 
+def _get_lambda_client() -> "BaseClient":
+    global _lambda_client
 
-def _publish_sns_message(
+    if _lambda_client is None:
+        import boto3
+
+        _lambda_client = boto3.client("lambda")
+    return _lambda_client
+
+
+def _invoke_manage_instance(
     command: str,
     interaction_id: str,
     interaction_token: str,
@@ -90,16 +105,17 @@ def _publish_sns_message(
     server_id: str,
 ) -> None:
     LOGGER.info(
-        "Publishing %s command for server %s in region %s (interaction %s)",
+        "Invoking %s command for server %s in region %s (interaction %s)",
         command,
         server_id,
         region,
         interaction_id,
     )
 
-    _sns_client.publish(
-        TopicArn=MANAGER_INSTRUCTION_SNS_TOPIC_ARN,
-        Message=json.dumps(
+    _get_lambda_client().invoke(
+        FunctionName=MANAGE_INSTANCE_FUNCTION_NAME,
+        InvocationType="Event",
+        Payload=orjson.dumps(
             {
                 "interactionId": interaction_id,
                 "interactionToken": interaction_token,
@@ -113,15 +129,16 @@ def _publish_sns_message(
 
 
 def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+    headers = _get_headers(event)
     body_bytes = _get_body_bytes(event)
 
-    if not _verify_request(event, body_bytes):
+    if not _verify_request(headers, body_bytes):
         LOGGER.warning("Invalid signature on incoming interaction")
         return _json_response(401, {"error": "Invalid signature"})
 
     try:
-        interaction = json.loads(body_bytes.decode("utf-8"))
-    except json.JSONDecodeError:
+        interaction = orjson.loads(body_bytes)
+    except orjson.JSONDecodeError:
         LOGGER.exception("Unable to parse request body")
         return _json_response(400, {"error": "Invalid JSON body"})
 
@@ -129,27 +146,26 @@ def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
     LOGGER.info("Interaction type: %s", interaction_type)
 
     if interaction_type == PING_INTERACTION:
-        return _json_response(200, {"type": PING_INTERACTION})
+        return _PING_RESPONSE
 
     if interaction_type != APPLICATION_COMMAND_INTERACTION:
         LOGGER.warning("Unsupported interaction type: %s", interaction_type)
         return _json_response(400, {"error": "Unsupported interaction type"})
 
-    server_value = _find_server_option_value(interaction)
+    command_name, interaction_id, interaction_token, server_value = (
+        _extract_command_fields(interaction)
+    )
+
     if not server_value or "|" not in server_value:
         LOGGER.warning("Missing server selection in interaction %s", interaction)
         return _json_response(400, {"error": "Missing server option"})
 
-    command_name = interaction.get("data", {}).get("name")
-    interaction_id = interaction.get("id")
-    interaction_token = interaction.get("token")
-
-    if not all([command_name, interaction_id, interaction_token]):
+    if not (command_name and interaction_id and interaction_token):
         LOGGER.error("Interaction missing required fields: %s", interaction)
         return _json_response(400, {"error": "Invalid interaction payload"})
     region, server_id = server_value.split("|", 1)
 
-    _publish_sns_message(
+    _invoke_manage_instance(
         command=command_name,
         interaction_id=interaction_id,
         interaction_token=interaction_token,
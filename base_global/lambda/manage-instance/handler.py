@@ -1,10 +1,10 @@
-import json
 import logging
 import os
 from typing import Any, Dict, Optional
-from urllib import error, request
 
 import boto3
+import orjson
+import urllib3
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
 
@@ -15,13 +15,34 @@ DISCORD_APP_ID = os.environ["DISCORD_APP_ID"]
 DISCORD_BOT_TOKEN = os.environ["DISCORD_BOT_TOKEN"]
 DISCORD_BASE_URL = "https://discord.com/api/v10"
 
+_AUTH_HEADERS = {
+    "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
+    "Content-Type": "application/json",
+}
+_WEBHOOK_PREFIX = f"{DISCORD_BASE_URL}/webhooks/{DISCORD_APP_ID}"
+
+_ec2_clients: Dict[str, BaseClient] = {}
+# Discord may close the kept-alive socket while the container is frozen, retry
+# once on a fresh connection (PATCHing @original is idempotent)
+_http = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=4,
+    retries=urllib3.Retry(total=1, connect=1, read=1, allowed_methods=None),
+)
+
 
 def _get_ec2_client(region: str) -> BaseClient:
-    return boto3.client("ec2", region_name=region)
+    client = _ec2_clients.get(region)
+    if client is None:
+        client = boto3.client("ec2", region_name=region)
+        _ec2_clients[region] = client
+    return client
 
 
 def _find_instance(ec2_client: BaseClient, server_id: str) -> Optional[Dict[str, Any]]:
-    response = ec2_client.describe_instances(
+    # A filtered page can come back empty with a NextToken pointing at the
+    # match, so follow pages but stop at the first hit
+    pages = ec2_client.get_paginator("describe_instances").paginate(
         Filters=[
             {
                 "Name": "tag:GameServerEC2Discord:ServerId",
@@ -30,35 +51,30 @@ def _find_instance(ec2_client: BaseClient, server_id: str) -> Optional[Dict[str,
         ]
     )
 
-    for reservation in response.get("Reservations", []):
-        for instance in reservation.get("Instances", []):
-            return instance
-    return None
-
-
-def _get_tag(tags: Optional[list], tag_key: str) -> Optional[str]:
-    if not tags:
-        return None
-    for tag in tags:
-        if tag.get("Key") == tag_key:
-            return tag.get("Value")
+    for page in pages:
+        for reservation in page.get("Reservations", ()):
+            for instance in reservation.get("Instances", ()):
+                return instance
     return None
 
 
 def _format_address_message(instance: Dict[str, Any]) -> str:
     public_dns = instance.get("PublicDnsName")
     public_ip = instance.get("PublicIpAddress")
-    tags = instance.get("Tags")
-    hostname = _get_tag(tags, "GameServerEC2Discord:Hostname")
-    main_port = _get_tag(tags, "GameServerEC2Discord:MainPort")
+    tags = {tag["Key"]: tag.get("Value") for tag in instance.get("Tags") or ()}
+    hostname = tags.get("GameServerEC2Discord:Hostname")
+    main_port = tags.get("GameServerEC2Discord:MainPort")
 
+    if not (public_ip or public_dns or hostname):
+        return "Instance has no public address yet"
+
+    port_suffix = f":{main_port}" if main_port else ""
     lines = ["Addresses:"]
     if public_ip:
-        lines.append(f"- **`{public_ip}:{main_port}`**")
-    if public_dns:
-        lines.append(f"- `{public_dns}:{main_port}`")
-    if hostname:
-        lines.append(f"- `{hostname}:{main_port}`")
+        lines.append(f"- **`{public_ip}{port_suffix}`**")
+    lines.extend(
+        f"- `{address}{port_suffix}`" for address in (public_dns, hostname) if address
+    )
 
     return "\n".join(lines)
 
@@ -102,44 +118,37 @@ def _send_ec2_command(
     return "Unknown command"
 
 
-def _parse_sns_message(event: Dict[str, Any]) -> Dict[str, Any]:
-    record = (event.get("Records") or [{}])[0]
-    payload = record.get("Sns", {}).get("Message", "{}")
-    return json.loads(payload)
-
-
 def _patch_interaction(interaction_token: str, content: str) -> None:
-    url = f"{DISCORD_BASE_URL}/webhooks/{DISCORD_APP_ID}/{interaction_token}/messages/@original"
-    data = json.dumps({"content": content}).encode("utf-8")
-    headers = {
-        "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-        "Content-Type": "application/json",
-    }
-
-    req = request.Request(url, data=data, headers=headers, method="PATCH")
+    url = f"{_WEBHOOK_PREFIX}/{interaction_token}/messages/@original"
+    data = orjson.dumps({"content": content})
+
     try:
-        with request.urlopen(req) as response:
-            LOGGER.info("Discord response status: %s", response.status)
-    except error.HTTPError as exc:
-        body = exc.read().decode("utf-8")
+        response = _http.request(
+            "PATCH", url, body=data, headers=_AUTH_HEADERS, timeout=5
+        )
+    except urllib3.exceptions.HTTPError:
+        LOGGER.exception("Failed to call Discord API")
+        return
+
+    if response.status >= 400:
         LOGGER.warning(
             "Discord API error (%s): %s",
-            exc.code,
-            body,
+            response.status,
+            response.data.decode("utf-8"),
         )
-    except error.URLError:
-        LOGGER.exception("Failed to call Discord API")
+        return
+
+    LOGGER.info("Discord response status: %s", response.status)
 
 
 def handler(event: Dict[str, Any], _context: Any) -> None:
-    message = _parse_sns_message(event)
-    command = message.get("command")
-    interaction_token = message.get("interactionToken")
-    server_id = message.get("serverId")
-    region = message.get("instanceRegion")
+    command = event.get("command")
+    interaction_token = event.get("interactionToken")
+    server_id = event.get("serverId")
+    region = event.get("instanceRegion")
 
     if not all([command, interaction_token, server_id, region]):
-        LOGGER.warning("Incomplete SNS message payload: %s", message)
+        LOGGER.warning("Incomplete invocation payload: %s", event)
         return
 
     ec2_message = _send_ec2_command(server_id, region, command)
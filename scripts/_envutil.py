@@ -0,0 +1,13 @@
+import os
+import re
+from pathlib import Path
+
+_ENV_LINE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M)
+
+
+def load_env_file(path: Path) -> None:
+    if not path.exists():
+        return
+
+    for key, value in _ENV_LINE.findall(path.read_text(encoding="utf-8")):
+        os.environ.setdefault(key, value)
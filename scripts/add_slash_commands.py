@@ -1,29 +1,77 @@
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
 import requests
 
+from _envutil import load_env_file
+
 BASE_URL = "https://discord.com/api/v10"
 SCRIPTS_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPTS_DIR.parent
 SERVERS_PATH = SCRIPTS_DIR / "servers.json"
 ENV_FILE = ROOT_DIR / ".env"
-
-
-def _load_env_file() -> None:
-    if not ENV_FILE.exists():
-        return
-
-    with ENV_FILE.open("r", encoding="utf-8") as env_file:
-        for line in env_file:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            os.environ.setdefault(key.strip(), value.strip())
+MAX_CONCURRENT_GUILDS = 8
+
+SERVER_OPTION = {
+    "type": 3,
+    "name": "server",
+    "name_localizations": {"pt-BR": "servidor"},
+    "description": "Which server to run the command for",
+    "description_localizations": {"pt-BR": "Para qual servidor executar o comando"},
+    "required": True,
+}
+
+# Guild independent part of each command, only the server choices vary
+COMMANDS: List[Dict[str, Any]] = [
+    {
+        "type": 1,
+        "name": "start",
+        "name_localizations": {"pt-BR": "iniciar"},
+        "description": "Starts a server",
+        "description_localizations": {"pt-BR": "Inicia um servidor"},
+        "options": [SERVER_OPTION],
+    },
+    {
+        "type": 1,
+        "name": "stop",
+        "name_localizations": {"pt-BR": "parar"},
+        "description": "Stops a server, if it's online",
+        "description_localizations": {
+            "pt-BR": "Desliga um servidor, se estiver online"
+        },
+        "options": [SERVER_OPTION],
+    },
+    {
+        "type": 1,
+        "name": "restart",
+        "name_localizations": {"pt-BR": "reiniciar"},
+        "description": "Restarts a server, if it's online",
+        "description_localizations": {
+            "pt-BR": "Reinicia um servidor, se estiver online"
+        },
+        "options": [SERVER_OPTION],
+    },
+    {
+        "type": 1,
+        "name": "ip",
+        "description": "Shows the server IP address",
+        "description_localizations": {"pt-BR": "Exibe o endereço IP do servidor"},
+        "options": [SERVER_OPTION],
+    },
+    {
+        "type": 1,
+        "name": "status",
+        "description": "Shows server host status",
+        "description_localizations": {
+            "pt-BR": "Exibe o estado do host do servidor"
+        },
+        "options": [SERVER_OPTION],
+    },
+]
 
 
 def _require_env(name: str) -> str:
@@ -46,93 +94,26 @@ def _load_servers() -> List[Dict[str, str]]:
         return json.load(file)
 
 
-def _build_command_payload(servers: List[Dict[str, str]]) -> List[Dict[str, object]]:
-    server_choices = [
-        {
-            "name": server["choiceDisplayName"],
-            "value": f"{server['region']}|{server['gameServerId']}",
-        }
-        for server in servers
-    ]
-
+def _build_command_payload(servers: List[Dict[str, str]]) -> List[Dict[str, Any]]:
     server_option = {
-        "type": 3,
-        "name": "server",
-        "name_localizations": {"pt-BR": "servidor"},
-        "description": "Which server to run the command for",
-        "description_localizations": {
-            "pt-BR": "Para qual servidor executar o comando"
-        },
-        "required": True,
-        "choices": server_choices,
+        **SERVER_OPTION,
+        "choices": [
+            {
+                "name": server["choiceDisplayName"],
+                "value": f"{server['region']}|{server['gameServerId']}",
+            }
+            for server in servers
+        ],
     }
 
-    commands = [
-        {
-            "name": "start",
-            "name_localizations": {"pt-BR": "iniciar"},
-            "description": "Starts a server",
-            "description_localizations": {"pt-BR": "Inicia um servidor"},
-            "include_option": True,
-        },
-        {
-            "name": "stop",
-            "name_localizations": {"pt-BR": "parar"},
-            "description": "Stops a server, if it's online",
-            "description_localizations": {
-                "pt-BR": "Desliga um servidor, se estiver online"
-            },
-            "include_option": True,
-        },
-        {
-            "name": "restart",
-            "name_localizations": {"pt-BR": "reiniciar"},
-            "description": "Restarts a server, if it's online",
-            "description_localizations": {
-                "pt-BR": "Reinicia um servidor, se estiver online"
-            },
-            "include_option": True,
-        },
-        {
-            "name": "ip",
-            "description": "Shows the server IP address",
-            "description_localizations": {
-                "pt-BR": "Exibe o endereço IP do servidor"
-            },
-            "include_option": True,
-        },
-        {
-            "name": "status",
-            "description": "Shows server host status",
-            "description_localizations": {
-                "pt-BR": "Exibe o estado do host do servidor"
-            },
-            "include_option": True,
-        },
+    return [
+        {**command, "options": [server_option]} if "options" in command else command
+        for command in COMMANDS
     ]
 
-    payload = []
-
-    for command in commands:
-        payload_item = {
-            "type": 1,
-            "name": command["name"],
-            "description": command["description"],
-            "description_localizations": command["description_localizations"],
-        }
-        if "name_localizations" in command:
-            payload_item["name_localizations"] = command["name_localizations"]
-        if command.get("include_option"):
-            option_payload = dict(server_option)
-            option_payload["choices"] = list(server_option["choices"])
-            payload_item["options"] = [option_payload]
-        payload.append(payload_item)
-
-    return payload
-
 
 def _overwrite_guild_commands(
-    session: requests.Session, app_id: str, bot_token: str, guild_id: str, commands: List[Dict[str, object]]
+    session: requests.Session, app_id: str, bot_token: str, guild_id: str, commands: List[Dict[str, Any]]
 ) -> None:
     url = f"{BASE_URL}/applications/{app_id}/guilds/{guild_id}/commands"
     response = session.put(
@@ -154,7 +135,7 @@ def _overwrite_guild_commands(
 
 
 def main() -> None:
-    _load_env_file()
+    load_env_file(ENV_FILE)
     app_id = _require_env("DISCORD_APP_ID")
     bot_token = _require_env("DISCORD_APP_BOT_TOKEN")
     servers = _load_servers()
@@ -168,11 +149,17 @@ def main() -> None:
         sys.exit(1)
 
     session = requests.Session()
-    for guild_id, guild_servers in guilds.items():
+
+    def update_guild(guild: Tuple[str, List[Dict[str, str]]]) -> None:
+        guild_id, guild_servers = guild
         commands = _build_command_payload(guild_servers)
         _overwrite_guild_commands(session, app_id, bot_token, guild_id, commands)
         print(f"Done guild {guild_id}\n")
 
+    # Guilds are independent, so their PUTs can share the session's pool
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_GUILDS) as executor:
+        list(executor.map(update_guild, guilds.items()))
+
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,12 @@
 import json
 import os
 import subprocess
-import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
+
+import ijson
+
+from _envutil import load_env_file
 
 SCRIPTS_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPTS_DIR.parent
@@ -11,52 +14,27 @@ SERVERS_FILE = SCRIPTS_DIR / "servers.json"
 ENV_FILE = ROOT_DIR / ".env"
 
 
-def _load_env_file() -> None:
-    if not ENV_FILE.exists():
-        return
-
-    with ENV_FILE.open("r", encoding="utf-8") as env_file:
-        for line in env_file:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            os.environ.setdefault(key.strip(), value.strip())
-
-
-def _run_terraform_show() -> Dict[str, Any]:
+def _iter_child_modules() -> Iterator[Dict[str, Any]]:
     cmd = ["terraform", "show", "-json", "-no-color"]
     state_path = os.getenv("TF_STATE_PATH")
     if state_path:
         cmd.append(state_path)
 
-    try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-    except subprocess.CalledProcessError as exc:
-        print(exc.stderr or exc.stdout, file=sys.stderr)
-        raise SystemExit(exc.returncode)
+    # Stream the state so only one child module is held in memory at a time
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as process:
+        try:
+            yield from ijson.items(
+                process.stdout, "values.root_module.child_modules.item"
+            )
+        except ijson.JSONError:
+            if process.wait() == 0:
+                raise
 
-    return json.loads(result.stdout)
+        if process.wait() != 0:
+            raise SystemExit(process.returncode)
 
 
-def _is_server_module(module: Dict[str, Any]) -> bool:
-    for child in module.get("child_modules", []):
-        for resource in child.get("resources", []):
-            tags = resource.get("values", {}).get("tags") or {}
-            if (
-                resource.get("type") == "aws_spot_instance_request"
-                and tags.get("GameServerEC2Discord:ServerId")
-            ):
-                return True
-    return False
-
-
-def _extract_tags(module: Dict[str, Any]) -> Dict[str, Any]:
+def _server_tags(module: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     for child in module.get("child_modules", []):
         for resource in child.get("resources", []):
             if resource.get("type") != "aws_spot_instance_request":
@@ -64,38 +42,41 @@ def _extract_tags(module: Dict[str, Any]) -> Dict[str, Any]:
             tags = resource.get("values", {}).get("tags")
             if tags and tags.get("GameServerEC2Discord:ServerId"):
                 return tags
-    raise RuntimeError(f"No spot instance request found in module {module.get('address')}")
+    return None
 
 
-def _build_config(modules: List[Dict[str, Any]]) -> List[Dict[str, str]]:
-    config = []
-    for module in modules:
-        tags = _extract_tags(module)
-        config.append(
-            {
-                "region": tags["GameServerEC2Discord:Region"],
-                "gameServerId": tags["GameServerEC2Discord:ServerId"],
-                "discordGuildId": "<Discord Guild ID here>",
-                "choiceDisplayName": tags["GameServerEC2Discord:ServerId"],
-            }
-        )
-    return config
+def _build_config(server_tag_sets: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    return [
+        {
+            "region": tags["GameServerEC2Discord:Region"],
+            "gameServerId": tags["GameServerEC2Discord:ServerId"],
+            "discordGuildId": "<Discord Guild ID here>",
+            "choiceDisplayName": tags["GameServerEC2Discord:ServerId"],
+        }
+        for tags in server_tag_sets
+    ]
 
 
 def main() -> None:
-    _load_env_file()
+    load_env_file(ENV_FILE)
     print("Retrieving terraform state")
-    state = _run_terraform_show()
-    child_modules = state.get("values", {}).get("root_module", {}).get("child_modules", [])
-
-    print(f"Child modules found: {len(child_modules)}")
-    server_modules = [module for module in child_modules if _is_server_module(module)]
+    child_module_count = 0
+    server_addresses = []
+    server_tag_sets = []
+    for module in _iter_child_modules():
+        child_module_count += 1
+        tags = _server_tags(module)
+        if tags is not None:
+            server_addresses.append(module.get("address"))
+            server_tag_sets.append(tags)
+
+    print(f"Child modules found: {child_module_count}")
 
     print("Server modules found:")
-    for module in server_modules:
-        print(f"- {module.get('address')}")
+    for address in server_addresses:
+        print(f"- {address}")
 
-    server_config = _build_config(server_modules)
+    server_config = _build_config(server_tag_sets)
     SERVERS_FILE.write_text(json.dumps(server_config, indent=2), encoding="utf-8")
     print(f"{SERVERS_FILE} created")
 